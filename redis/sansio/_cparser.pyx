@@ -0,0 +1,322 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""A compiled RESP2/3 parser, mirroring :py:class:`~redis.sansio._parser.PythonParser`.
+
+This module is developer-only: the package build neither compiles nor ships it.
+Build it in-place with ``cythonize -i redis/sansio/_cparser.pyx``. When the extension
+is importable (and hiredis>=2.1 is not), :py:mod:`redis.sansio.reader` prefers it
+over the pure-Python parser. ``tests/test_parser.py`` checks it against
+:py:class:`~redis.sansio._parser.PythonParser`.
+"""
+from cpython.bytearray cimport PyByteArray_AS_STRING, PyByteArray_GET_SIZE
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from cpython.pyport cimport PY_SSIZE_T_MAX
+from cpython.unicode cimport PyUnicode_Decode
+from libc.string cimport memchr
+
+# Markers for "the buffer ran out mid-element" and "an aggregate was opened".
+cdef object _INCOMPLETE = object()
+cdef object _OPENED = object()
+
+cdef enum:
+    _LIST = 0
+    _SET = 1
+    _DICT = 2
+
+
+cdef class _Frame:
+    """An aggregate which is still waiting on some of its elements."""
+
+    cdef object container
+    cdef Py_ssize_t index
+    cdef Py_ssize_t length
+    cdef int kind
+    cdef object key
+    cdef bint has_key
+
+    cdef bint add(self, object val):
+        # Place `val` in the container, returning whether the aggregate is complete.
+        if self.kind == _LIST:
+            (<list>self.container)[self.index] = val
+        elif self.kind == _SET:
+            (<set>self.container).add(val)
+        elif not self.has_key:
+            self.key = val
+            self.has_key = True
+            return False
+        else:
+            (<dict>self.container)[self.key] = val
+            self.key = None
+            self.has_key = False
+        self.index += 1
+        return self.index == self.length
+
+
+cdef class CythonParser:
+    """A RESP2/3 parser compiled with Cython.
+
+    Parses straight out of the receive buffer with C-level scanning and integer
+    decoding. Partially-received aggregates are kept on an explicit stack of frames,
+    so a reply split across many reads is never re-parsed from the start.
+
+    Note:
+        Like :py:class:`~redis.sansio._parser.PythonParser`, this class does NOT
+        implement Push, Streamed or Attribute protocols.
+    """
+
+    cdef bytearray buf
+    cdef Py_ssize_t pos
+    cdef public object protocolError
+    cdef public object replyError
+    cdef public object notEnoughData
+    cdef object _encoding
+    cdef object _encoding_errors
+    cdef bytes _enc
+    cdef bytes _errs
+    cdef object _err
+    cdef list _stack
+
+    def __init__(
+        self,
+        protocolError,
+        replyError,
+        notEnoughData=False,
+        encoding=None,
+        errors=None,
+    ):
+        self.buf = bytearray()
+        self.pos = 0
+        self.protocolError = protocolError
+        self.replyError = replyError
+        self.notEnoughData = notEnoughData
+        self._err = None
+        self._stack = []
+        self._encoding = None
+        self._encoding_errors = errors or "strict"
+        self._errs = self._encoding_errors.encode()
+        self.encoding = encoding
+
+    @property
+    def encoding(self):
+        return self._encoding
+
+    @encoding.setter
+    def encoding(self, val):
+        self._encoding = val
+        self._enc = val.encode() if val else None
+
+    @property
+    def encoding_errors(self):
+        return self._encoding_errors
+
+    @encoding_errors.setter
+    def encoding_errors(self, val):
+        self._encoding_errors = val
+        self._errs = val.encode()
+
+    def feed(self, data):
+        cdef Py_ssize_t pos = self.pos
+        if pos and pos * 2 > PyByteArray_GET_SIZE(self.buf):
+            del self.buf[:pos]
+            self.pos = 0
+        self.buf.extend(data)
+
+    def has_data(self):
+        return PyByteArray_GET_SIZE(self.buf) > self.pos
+
+    def parse_one(self):
+        cdef list stack = self._stack
+        cdef _Frame frame
+        cdef Py_ssize_t start
+        if self._err is not None:
+            raise self._err
+        while True:
+            start = self.pos
+            val = self._parse_element()
+            if val is _INCOMPLETE:
+                self.pos = start
+                return self.notEnoughData
+            if val is _OPENED:
+                continue
+            while stack:
+                frame = <_Frame>stack[len(stack) - 1]
+                if not frame.add(val):
+                    break
+                stack.pop()
+                val = frame.container
+            else:
+                return val
+
+    cdef error(self, msg):
+        self._err = self.protocolError(msg)
+        return self._err
+
+    cdef object _parse_element(self):
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buf)
+        cdef const char *ptr = PyByteArray_AS_STRING(self.buf)
+        cdef Py_ssize_t length
+        cdef char ctl
+        if self.pos >= size:
+            return _INCOMPLETE
+        ctl = ptr[self.pos]
+        self.pos += 1
+        if ctl == c'$' or ctl == c'=':
+            length = self._readlength()
+            if length == -2:
+                return _INCOMPLETE
+            if length == -1:
+                return None
+            return self._readbulk(length, ctl == c'=')
+        if ctl == c'*' or ctl == c'>':
+            return self._open(_LIST)
+        if ctl == c'%':
+            return self._open(_DICT)
+        if ctl == c'~':
+            return self._open(_SET)
+        if ctl == c':' or ctl == c'(':
+            return self._readint()
+        if ctl == c'+':
+            return self._readline(True)
+        if ctl == c'-':
+            val = self._readline(False)
+            if val is _INCOMPLETE:
+                return val
+            return self.replyError(
+                (val or b"Error").decode(self._encoding or "utf8", "replace")
+            )
+        if ctl == c',':
+            val = self._readline(False)
+            if val is _INCOMPLETE:
+                return val
+            try:
+                return float(val)
+            except ValueError as exc:
+                raise self.error(exc)
+        if ctl == c'#':
+            val = self._readline(False)
+            if val is _INCOMPLETE:
+                return val
+            return val == b"t"
+        if ctl == c'_':
+            val = self._readline(False)
+            if val is _INCOMPLETE:
+                return val
+            return None
+        msg = bytes([<unsigned char>ctl]).decode("utf8", "replace")
+        raise self.error(f"Protocol Error: {msg!r}")
+
+    cdef object _open(self, int kind):
+        cdef Py_ssize_t length
+        cdef _Frame frame
+        val = self._readint()
+        if val is _INCOMPLETE:
+            return val
+        if val == -1:
+            return None
+        if val > PY_SSIZE_T_MAX:
+            raise self.error(f"Invalid length: {val}")
+        # Like `PythonParser`, any other negative length is an empty aggregate.
+        length = val if val > 0 else 0
+        if kind == _LIST:
+            container = [None] * length
+        elif kind == _SET:
+            container = set()
+        else:
+            container = {}
+        if length == 0:
+            return container
+        frame = _Frame.__new__(_Frame)
+        frame.container = container
+        frame.index = 0
+        frame.length = length
+        frame.kind = kind
+        frame.has_key = False
+        self._stack.append(frame)
+        return _OPENED
+
+    cdef Py_ssize_t _findcrlf(self):
+        # The offset of the next b"\r\n", or -1 if it hasn't arrived yet.
+        cdef Py_ssize_t size = PyByteArray_GET_SIZE(self.buf)
+        cdef const char *ptr = PyByteArray_AS_STRING(self.buf)
+        cdef const char *cur = ptr + self.pos
+        cdef const char *end = ptr + size
+        cdef const char *lf
+        while cur < end:
+            lf = <const char *>memchr(cur, c'\n', end - cur)
+            if lf == NULL:
+                return -1
+            if lf > ptr + self.pos and (lf - 1)[0] == c'\r':
+                return lf - ptr - 1
+            cur = lf + 1
+        return -1
+
+    cdef object _readline(self, bint decode):
+        cdef Py_ssize_t offset = self._findcrlf()
+        cdef const char *ptr
+        if offset < 0:
+            return _INCOMPLETE
+        ptr = PyByteArray_AS_STRING(self.buf) + self.pos
+        if decode and self._enc is not None:
+            val = PyUnicode_Decode(ptr, offset - self.pos, self._enc, self._errs)
+        else:
+            val = PyBytes_FromStringAndSize(ptr, offset - self.pos)
+        self.pos = offset + 2
+        return val
+
+    cdef object _readint(self):
+        cdef Py_ssize_t offset = self._findcrlf()
+        cdef const char *ptr = PyByteArray_AS_STRING(self.buf)
+        cdef Py_ssize_t i = self.pos
+        cdef long long n = 0
+        cdef bint neg = False
+        if offset < 0:
+            return _INCOMPLETE
+        if i < offset and ptr[i] == c'-':
+            neg = True
+            i += 1
+        if i == offset or offset - i > 18:
+            return self._readint_slow(offset)
+        while i < offset:
+            if ptr[i] < c'0' or ptr[i] > c'9':
+                return self._readint_slow(offset)
+            n = n * 10 + (ptr[i] - c'0')
+            i += 1
+        self.pos = offset + 2
+        return -n if neg else n
+
+    cdef object _readint_slow(self, Py_ssize_t offset):
+        cdef const char *ptr = PyByteArray_AS_STRING(self.buf)
+        try:
+            val = int(PyBytes_FromStringAndSize(ptr + self.pos, offset - self.pos))
+        except ValueError as exc:
+            raise self.error(exc)
+        self.pos = offset + 2
+        return val
+
+    cdef Py_ssize_t _readlength(self) except -3:
+        # A bulk length, -1 for null, or -2 if incomplete.
+        val = self._readint()
+        if val is _INCOMPLETE:
+            return -2
+        if val < -1 or val > PY_SSIZE_T_MAX:
+            raise self.error(f"Invalid length: {val}")
+        return val
+
+    cdef object _readbulk(self, Py_ssize_t length, bint verbatim):
+        cdef const char *ptr = PyByteArray_AS_STRING(self.buf)
+        cdef Py_ssize_t start = self.pos
+        cdef Py_ssize_t offset
+        # Written so as not to overflow for lengths close to `PY_SSIZE_T_MAX`.
+        if PyByteArray_GET_SIZE(self.buf) - start - 2 < length:
+            return _INCOMPLETE
+        offset = start + length
+        if ptr[offset] != c'\r' or ptr[offset + 1] != c'\n':
+            raise self.error("Expected b'\r\n'")
+        if verbatim:
+            # Verbatim strings are prefixed with a 3-byte format, e.g. b"txt:".
+            if length < 4 or ptr[start + 3] != c':':
+                raise self.error("Invalid verbatim string")
+            start += 4
+        self.pos = offset + 2
+        if self._enc is not None:
+            return PyUnicode_Decode(ptr + start, offset - start, self._enc, self._errs)
+        return PyBytes_FromStringAndSize(ptr + start, offset - start)
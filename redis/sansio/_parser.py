@@ -1,13 +1,51 @@
 from __future__ import annotations
 
-from typing import AnyStr, Callable, Generator, Iterator
+import sys
+from typing import AnyStr, Callable, List, Optional
 
 from redis.sansio.types import EncodableT, NotEnoughDataT
 
+# Internal marker for "the buffer ran out mid-element".
+#   This can't be `notEnoughData`, since that may be a valid reply (e.g. `False`).
+_INCOMPLETE = object()
+
+# The message for an error reply which didn't come with one.
+_EMPTY_ERR = b"Error"
+
+# The longest bulk string or aggregate a reply may declare (`PY_SSIZE_T_MAX`).
+_MAX_LENGTH = sys.maxsize
+
+# The value of each ascii digit by byte, or -1 for anything which isn't one. Only
+#   used for the short lines handled by `PythonParser._readint_fast`.
+_DIGIT = [i - 0x30 if 0x30 <= i <= 0x39 else -1 for i in range(256)]
+
+ProtocolTableT = List[Optional[Callable[["PythonParser"], EncodableT]]]
+FillT = Callable[..., EncodableT]
+
+
+def _make_table(protocols: dict[bytes, Callable]) -> ProtocolTableT:
+    table: ProtocolTableT = [None] * 256
+    for ctl, fn in protocols.items():
+        table[ctl[0]] = fn
+    return table
+
+
+def _make_decoder(encoding: str | None, errors: str) -> Callable[[bytes], EncodableT]:
+    if not encoding:
+        return lambda val: val
+    return lambda val: val.decode(encoding, errors)
+
+
+def _ctl_repr(ctl: int) -> str:
+    return repr(bytes((ctl,)).decode(encoding="utf8", errors="replace"))
+
 
 class PythonParser:
     """A pure-Python parser for the RESP2/3.
 
+    Data may only be added with :py:meth:`feed`, which keeps the parser's view over
+    its buffer valid.
+
     Note:
         This class does NOT implement protocols:
 
@@ -29,15 +67,20 @@ class PythonParser:
     """
 
     __slots__ = (
-        "buf",
+        "_buf",
         "pos",
         "protocolError",
         "replyError",
         "notEnoughData",
         "_encoding",
-        "encoding_errors",
+        "_encoding_errors",
+        "_decode",
+        "_err_enc",
         "_err",
-        "_gen",
+        "_stack",
+        "_base",
+        "_scan_pos",
+        "_mv",
         "_protocols",
     )
 
@@ -50,17 +93,29 @@ class PythonParser:
         errors: str | None = None,
     ):
 
-        self.buf: bytearray = bytearray()
+        self._buf: bytearray = bytearray()
         self.pos: int = 0
         self.protocolError: Callable = protocolError
         self.replyError: Callable = replyError
         self.notEnoughData = notEnoughData
-        self.encoding_errors: str = errors or "strict"
+        self._encoding_errors: str = errors or "strict"
         self._encoding: str | None = encoding
+        # Bound once here (and by the setters), rather than resolved per value.
+        self._decode = _make_decoder(encoding, self._encoding_errors)
+        self._err_enc: str = encoding or "utf8"
         self._err = None
-        self._gen: Generator | None = None
-        self._protocols: dict[bytes, Callable[[PythonParser], EncodableT]] = (
-            self._PROTOCOLS_DECODE if self.encoding else self._PROTOCOLS
+        # Partially-parsed aggregates, outermost first, as (fill, container,
+        #   remaining, key) - with `key` only set for a dict awaiting a value.
+        self._stack: list[tuple[FillT, list | set | dict, int, EncodableT]] = []
+        # The depth of the stack when the current parse attempt began.
+        self._base: int = 0
+        # How far an unfinished line has already been searched for b"\r\n".
+        self._scan_pos: int = 0
+        # A shared view over `_buf`, so lines are copied out of it exactly once.
+        #   A bytearray can't be resized while it's exported, so `feed` swaps it.
+        self._mv: memoryview = memoryview(self._buf)
+        self._protocols: ProtocolTableT = (
+            self._PROTOCOLS_TBL_DECODE if self.encoding else self._PROTOCOLS_TBL
         )
 
     @property
@@ -70,179 +125,348 @@ class PythonParser:
     @encoding.setter
     def encoding(self, val: str):
         self._encoding = val
-        self._protocols = self._PROTOCOLS_DECODE
+        self._decode = _make_decoder(val, self._encoding_errors)
+        self._err_enc = val or "utf8"
+        self._protocols = self._PROTOCOLS_TBL_DECODE if val else self._PROTOCOLS_TBL
+
+    @property
+    def encoding_errors(self) -> str:
+        return self._encoding_errors
+
+    @encoding_errors.setter
+    def encoding_errors(self, val: str):
+        self._encoding_errors = val
+        self._decode = _make_decoder(self._encoding, val)
+
+    def feed(self, data: bytes | bytearray | memoryview):
+        # `bytearray.extend` takes any buffer, so a memoryview over a socket's
+        #   receive buffer is copied exactly once, straight into ours.
+        self._mv.release()
+        self._compact()
+        self._buf.extend(data)
+        self._mv = memoryview(self._buf)
+
+    def has_data(self) -> bool:
+        return len(self._buf) > self.pos
+
+    def _compact(self):
+        # Drop consumed bytes from the head of the buffer, but only once they make
+        #   up the bulk of it, so the memmove is amortized over many replies.
+        pos = self.pos
+        if pos and pos * 2 > len(self._buf):
+            del self._buf[:pos]
+            self.pos = 0
+            if self._scan_pos:
+                self._scan_pos -= pos
+
+    def error(self, msg):
+        self._err = self.protocolError(msg)
+        return self._err
 
-    def waitsome(self, size: int) -> Iterator[NotEnoughDataT]:
-        # keep yielding false until at least `size` bytes added to buf.
-        while len(self.buf) < self.pos + size:
-            yield self.notEnoughData
+    def parse_one(self):
+        # Protocol errors are sticky, so check once per reply rather than per element.
+        if self._err is not None:
+            raise self._err
+        if self._stack:
+            val = self._resume()
+        else:
+            val = self._parse()
+        if val is _INCOMPLETE:
+            return self.notEnoughData
+        return val
 
-    def waitany(self) -> Iterator[NotEnoughDataT]:
-        yield from self.waitsome(len(self.buf) + 1)
+    def _resume(self) -> EncodableT:
+        # Pick up the partially-parsed reply from the innermost aggregate outwards,
+        #   handing each finished aggregate to its parent as its next element.
+        #   The innermost frame has nothing to hand over, hence `_INCOMPLETE`.
+        stack = self._stack
+        val = _INCOMPLETE
+        while stack:
+            fill, container, remaining, key = stack.pop()
+            self._base = len(stack)
+            val = fill(self, container, remaining, key, val)
+            if val is _INCOMPLETE:
+                return val
+        return val
 
-    def readone(self) -> bytes:
-        if not self.buf[self.pos : self.pos + 1]:
-            yield from self.waitany()
-        val = self.buf[self.pos : self.pos + 1]
-        self.pos += 1
-        return bytes(val)
+    def _suspend(
+        self,
+        fill: FillT,
+        val: list | set | dict,
+        remaining: int,
+        key: EncodableT = _INCOMPLETE,
+    ) -> object:
+        # Save a partially-filled aggregate. Frames are saved innermost-first as the
+        #   parse unwinds, so insert each one beneath those saved before it in this
+        #   attempt, keeping the stack ordered from outermost to innermost.
+        self._stack.insert(self._base, (fill, val, remaining, key))
+        return _INCOMPLETE
+
+    def _parse(self) -> EncodableT:
+        buf = self._buf
+        pos = self.pos
+        if pos >= len(buf):
+            return _INCOMPLETE
+        ctl = buf[pos]
+        fn = self._protocols[ctl]
+        if fn is None:
+            raise self.error(f"Protocol Error: {_ctl_repr(ctl)}")
+        self.pos = pos + 1
+        val = fn(self)
+        if val is _INCOMPLETE and len(self._stack) == self._base:
+            # Nothing was saved, so rewind and retry the whole element next time.
+            self.pos = pos
+        return val
 
-    def readline(self, size: int | None = None) -> bytes:
+    def _readline(self, size: int | None = None) -> bytes:
+        buf = self._buf
+        pos = self.pos
         if size is not None:
-            if len(self.buf) < size + 2 + self.pos:
-                yield from self.waitsome(size + 2)
-            offset = self.pos + size
-            if self.buf[offset : offset + 2] != b"\r\n":
+            if size < 0 or size > _MAX_LENGTH:
+                raise self.error(f"Invalid length: {size}")
+            offset = pos + size
+            if len(buf) < offset + 2:
+                return _INCOMPLETE
+            if buf[offset] != 0x0D or buf[offset + 1] != 0x0A:
                 raise self.error("Expected b'\r\n'")
         else:
-            offset = self.buf.find(b"\r\n", self.pos)
-            while offset < 0:
-                yield from self.waitany()
-                offset = self.buf.find(b"\r\n", self.pos)
-        val = self.buf[self.pos : offset]
-        self.pos = 0
-        del self.buf[: offset + 2]
-        return bytes(val)
-
-    def readint(self):
-        try:
-            return int((yield from self.readline()))
-        except ValueError as exc:
-            raise self.error(exc)
+            scan = self._scan_pos
+            offset = buf.find(b"\r\n", scan - 1 if scan > pos else pos)
+            if offset < 0:
+                self._scan_pos = len(buf)
+                return _INCOMPLETE
+            if scan:
+                self._scan_pos = 0
+        val = bytes(self._mv[pos:offset])
+        self.pos = offset + 2
+        return val
 
-    def readfloat(self):
-        try:
-            return float((yield from self.readline()))
-        except ValueError as exc:
-            raise self.error(exc)
+    def _readverbatim(self, length: int) -> bytes:
+        if length < 0 or length > _MAX_LENGTH:
+            raise self.error(f"Invalid length: {length}")
+        buf = self._buf
+        pos = self.pos
+        offset = pos + length
+        if len(buf) < offset + 2:
+            return _INCOMPLETE
+        if buf[offset] != 0x0D or buf[offset + 1] != 0x0A:
+            raise self.error("Expected b'\r\n'")
+        # Verbatim strings are prefixed with a 3-byte format, e.g. b"txt:", which
+        #   is skipped over in the view rather than split off of a copy.
+        if length < 4 or buf[pos + 3] != 0x3A:
+            raise self.error("Invalid verbatim string")
+        val = bytes(self._mv[pos + 4 : offset])
+        self.pos = offset + 2
+        return val
 
-    def readbool(self):
+    def _readint_fast(self) -> int:
+        # RESP length headers are almost always one to three ascii digits, which
+        #   are cheaper to accumulate by hand than to copy out to `bytes` and hand
+        #   to `int()`. Past that the loop loses to `int()`, so longer (or
+        #   non-digit) lines go straight to `int()`.
+        buf = self._buf
+        start = self.pos
+        scan = self._scan_pos
+        offset = buf.find(b"\r\n", scan - 1 if scan > start else start)
+        if offset < 0:
+            self._scan_pos = len(buf)
+            return _INCOMPLETE
+        if scan:
+            self._scan_pos = 0
+        neg = buf[start] == 0x2D if start < offset else False
+        i = start + neg
+        if i == offset or offset - i > 3:
+            return self._readint_slow(start, offset)
+        n = 0
+        digit = _DIGIT
+        for i in range(i, offset):
+            d = digit[buf[i]]
+            if d < 0:
+                return self._readint_slow(start, offset)
+            n = n * 10 + d
+        self.pos = offset + 2
+        return -n if neg else n
+
+    def _readint_slow(self, start: int, offset: int) -> int:
         try:
-            val = yield from self.readline()
-            return True if val == b"t" else False
+            val = int(bytes(self._mv[start:offset]))
         except ValueError as exc:
             raise self.error(exc)
-
-    def error(self, msg):
-        self._err = self.protocolError(msg)
-        return self._err
-
-    def parse(self) -> Generator[EncodableT, None, None]:
-        if self._err is not None:
-            raise self._err
-        ctl: bytes | None = yield from self.readone()
-        if ctl not in self._protocols:
-            msg = ctl if ctl is None else ctl.decode(encoding="utf8", errors="replace")
-            raise self.error(f"Protocol Error: {msg!r}")
-        return (yield from self._protocols[ctl](self))
-
-    def parse_one(self):
-        if self._gen is None:
-            self._gen = self.parse()
-        try:
-            self._gen.send(None)
-        except StopIteration as exc:
-            self._gen = None
-            return exc.value
-        except Exception:
-            self._gen = None
-            raise
-        else:
-            return self.notEnoughData
+        self.pos = offset + 2
+        return val
 
     def _parse_error(self) -> Exception:
-        val: bytes | None = yield from self.readline()
-        return self.replyError(
-            (val or b"Error").decode(self.encoding or "utf8", errors="replace")
-        )
+        val = self._readline()
+        if val is _INCOMPLETE:
+            return val
+        return self.replyError((val or _EMPTY_ERR).decode(self._err_enc, "replace"))
 
     def _parse_single(self) -> bytes:
-        val = yield from self.readline()
-        return val
+        return self._readline()
 
     def _parse_single_decode(self) -> str:
-        val = yield from self._parse_single()
-        return self._maybe_decode(val)
+        val = self._readline()
+        if val is _INCOMPLETE:
+            return val
+        return self._decode(val)
 
     def _parse_verbatim(self) -> bytes:
-        length = yield from self.readint()
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
         if length == -1:
             return None
-        vbt: bytes = yield from self.readline(size=length)
-        typ, val = vbt.split(b":", maxsplit=1)
-        return val
+        return self._readverbatim(length)
 
     def _parse_verbatim_decode(self) -> str:
-        val = yield from self._parse_verbatim()
-        return self._maybe_decode(val=val)
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
+        if length == -1:
+            return None
+        val = self._readverbatim(length)
+        if val is _INCOMPLETE:
+            return val
+        return self._decode(val)
 
     def _parse_int(self) -> int:
-        return (yield from self.readint())
+        return self._readint_fast()
 
     def _parse_float(self) -> float:
-        return (yield from self.readfloat())
+        val = self._readline()
+        if val is _INCOMPLETE:
+            return val
+        try:
+            return float(val)
+        except ValueError as exc:
+            raise self.error(exc)
+
+    def _parse_bool(self) -> bool:
+        val = self._readline()
+        if val is _INCOMPLETE:
+            return val
+        return val == b"t"
+
+    def _parse_null(self) -> None:
+        val = self._readline()
+        if val is _INCOMPLETE:
+            return val
+        return None
 
     def _parse_bulk(self) -> bytes | None:
-        length = yield from self.readint()
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
         if length == -1:
             return None
-        val: bytes = yield from self.readline(length)
-        return val
+        return self._readline(length)
 
-    def _parse_bulk_decode(self) -> bytes | None:
-        val = yield from self._parse_bulk()
-        return self._maybe_decode(val=val)
+    def _parse_bulk_decode(self) -> str | None:
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
+        if length == -1:
+            return None
+        val = self._readline(length)
+        if val is _INCOMPLETE:
+            return val
+        return self._decode(val)
 
     def _parse_mutibulk(self) -> list[AnyStr] | None:
-        length = yield from self.readint()
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
         if length == -1:
             return None
-        val = []
-        append = val.append
-        parse = self.parse
-        for _ in range(length):
-            append((yield from parse()))
-        return val
-
-    def _parse_null(self) -> None:
-        yield from self.readline()
-        return None
-
-    def _parse_bool(self) -> bool:
-        return (yield from self.readbool())
+        if length > _MAX_LENGTH:
+            raise self.error(f"Invalid length: {length}")
+        return self._fill_list([None] * length, length)
 
     def _parse_dict(self) -> dict[AnyStr, EncodableT] | None:
-        keynum = yield from self.readint()
+        keynum = self._readint_fast()
+        if keynum is _INCOMPLETE:
+            return keynum
         if keynum == -1:
             return None
-        val = {}
-        parse = self.parse
-        for _ in range(keynum):
-            key = yield from parse()
-            v = yield from parse()
-            val[key] = v
-        return val
+        if keynum > _MAX_LENGTH:
+            raise self.error(f"Invalid length: {keynum}")
+        return self._fill_dict({}, keynum)
 
     def _parse_set(self) -> set[EncodableT] | None:
-        length = yield from self.readint()
+        length = self._readint_fast()
+        if length is _INCOMPLETE:
+            return length
         if length == -1:
             return None
-        val = set()
-        add = val.add
-        parse = self.parse
-        for _ in range(length):
-            add((yield from parse))
+        if length > _MAX_LENGTH:
+            raise self.error(f"Invalid length: {length}")
+        return self._fill_set(set(), length)
+
+    def _fill_list(
+        self,
+        val: list,
+        remaining: int,
+        key: EncodableT = _INCOMPLETE,
+        item: EncodableT = _INCOMPLETE,
+    ) -> list[AnyStr]:
+        length = len(val)
+        i = length - remaining
+        if item is not _INCOMPLETE:
+            val[i] = item
+            i += 1
+        parse = self._parse
+        for i in range(i, length):
+            item = parse()
+            if item is _INCOMPLETE:
+                return self._suspend(PythonParser._fill_list, val, length - i)
+            val[i] = item
         return val
 
-    def _parse_vector(self) -> list[AnyStr] | None:
-        return self._parse_mutibulk()
+    def _fill_dict(
+        self,
+        val: dict,
+        remaining: int,
+        key: EncodableT = _INCOMPLETE,
+        item: EncodableT = _INCOMPLETE,
+    ) -> dict[AnyStr, EncodableT]:
+        if item is not _INCOMPLETE:
+            if key is _INCOMPLETE:
+                key = item
+            else:
+                val[key] = item
+                key = _INCOMPLETE
+                remaining -= 1
+        parse = self._parse
+        for n in range(remaining, 0, -1):
+            if key is _INCOMPLETE:
+                key = parse()
+                if key is _INCOMPLETE:
+                    return self._suspend(PythonParser._fill_dict, val, n)
+            v = parse()
+            if v is _INCOMPLETE:
+                return self._suspend(PythonParser._fill_dict, val, n, key)
+            val[key] = v
+            key = _INCOMPLETE
+        return val
 
-    def _maybe_decode(self, val: bytes | None) -> str:
-        return (
-            val
-            if val is None
-            else val.decode(self.encoding, errors=self.encoding_errors)
-        )
+    def _fill_set(
+        self,
+        val: set,
+        remaining: int,
+        key: EncodableT = _INCOMPLETE,
+        item: EncodableT = _INCOMPLETE,
+    ) -> set[EncodableT]:
+        if item is not _INCOMPLETE:
+            val.add(item)
+            remaining -= 1
+        add = val.add
+        parse = self._parse
+        for n in range(remaining, 0, -1):
+            item = parse()
+            if item is _INCOMPLETE:
+                return self._suspend(PythonParser._fill_set, val, n)
+            add(item)
+        return val
 
     _PROTOCOLS: dict[bytes, Callable[[PythonParser], EncodableT]] = {
         b"-": _parse_error,
@@ -257,7 +481,7 @@ class PythonParser:
         b"*": _parse_mutibulk,
         b"~": _parse_set,
         b"%": _parse_dict,
-        b">": _parse_vector,
+        b">": _parse_mutibulk,
     }
 
     _PROTOCOLS_DECODE: dict[bytes, Callable[[PythonParser], EncodableT]] = {
@@ -273,5 +497,10 @@ class PythonParser:
         b"*": _parse_mutibulk,
         b"~": _parse_set,
         b"%": _parse_dict,
-        b">": _parse_vector,
+        b">": _parse_mutibulk,
     }
+
+    # Dispatch tables indexed directly by the type byte, so each element costs
+    #   a list index rather than hashing a 1-byte `bytes` for a dict probe.
+    _PROTOCOLS_TBL: ProtocolTableT = _make_table(_PROTOCOLS)
+    _PROTOCOLS_TBL_DECODE: ProtocolTableT = _make_table(_PROTOCOLS_DECODE)
@@ -12,6 +12,8 @@ class PythonBytesReader(BytesReaderProtocol):
 
     __slots__ = ("_parser",)
 
+    _parser_cls = PythonParser
+
     def __init__(
         self,
         protocolError: ErrorHandlerT = InvalidResponse,
@@ -20,7 +22,7 @@ class PythonBytesReader(BytesReaderProtocol):
         encoding: str | None = None,
         errors: str | None = None,
     ):
-        self._parser = PythonParser(
+        self._parser = self._parser_cls(
             protocolError=protocolError,
             replyError=replyError,
             notEnoughData=notEnoughData,
@@ -36,7 +38,9 @@ class PythonBytesReader(BytesReaderProtocol):
             raise ValueError("negative input")
         if o + l > len(data):
             raise ValueError("input is larger than buffer size")
-        self._parser.buf.extend(data[o : o + l])
+        if o or l != len(data):
+            data = memoryview(data)[o : o + l]
+        self._parser.feed(data)
 
     def gets(self) -> EncodableT | NotEnoughDataT | BaseException:
         """Get parsed value or False otherwise.
@@ -47,7 +51,7 @@ class PythonBytesReader(BytesReaderProtocol):
 
     def has_data(self) -> bool:
         """Whether the buffer has data pending read."""
-        return len(self._parser.buf) > self._parser.pos
+        return self._parser.has_data()
 
     def setmaxbuf(self, size: int | None) -> None:
         """No-op."""
@@ -28,15 +28,14 @@ class RedisOperator(Generic[ResponseBodyT]):
         notEnoughData: NotEnoughDataT = False,
     ):
         self._reader = reader.BytesReader(
-            exceptions.InvalidResponse, exceptions.ResponseError, encoding, errors
+            protocolError=exceptions.InvalidResponse,
+            replyError=exceptions.ResponseError,
+            notEnoughData=notEnoughData,
+            encoding=encoding,
+            errors=errors,
         )
         self._writer = writer.Writer(encoding=encoding, encoding_errors=errors)
-        self._sentinel = False
-        # TODO: awaiting latest release from hiredis-py:
-        #  https://github.com/redis/hiredis-py/pull/119
-        if isinstance(self._reader, reader.PythonBytesReader):
-            self._reader._parser.notEnoughData = notEnoughData
-            self._sentinel = notEnoughData
+        self._sentinel = notEnoughData
 
     def pack_command(
         self, event: events.Command | events.PipelinedCommands
@@ -1,13 +1,36 @@
 from __future__ import annotations
 
+import re
+
 from ._reader import PythonBytesReader
 from .types import BytesReaderProtocol
 
 __all__ = ("BytesReader", "BytesReaderProtocol", "PythonBytesReader")
 
-BytesReader: BytesReaderProtocol
+BytesReader: BytesReaderProtocol = PythonBytesReader
+
+try:
+    from ._cparser import CythonParser
+except (ImportError, ModuleNotFoundError):
+    pass
+else:
+
+    class CythonBytesReader(PythonBytesReader):
+        """RESP2/3 parser compiled from :py:mod:`redis.sansio._cparser`."""
+
+        __slots__ = ()
+
+        _parser_cls = CythonParser
+
+    BytesReader = CythonBytesReader
+    __all__ += ("CythonBytesReader",)
 
 try:
-    from hiredis import Reader as BytesReader
+    import hiredis
 except (ImportError, ModuleNotFoundError):
-    BytesReader = PythonBytesReader
+    pass
+else:
+    # Only hiredis>=2.1 accepts the `notEnoughData` sentinel.
+    _version = re.match(r"(\d+)\.(\d+)", hiredis.__version__)
+    if _version and tuple(map(int, _version.groups())) >= (2, 1):
+        BytesReader = hiredis.Reader
@@ -0,0 +1,291 @@
+"""Tests for the RESP parsers.
+
+:py:class:`~redis.sansio._parser.PythonParser` is checked against literal replies.
+``redis.sansio._cparser`` is only importable once it has been built in-place with
+``cythonize -i redis/sansio/_cparser.pyx``, so the tests checking it against the
+pure-Python parser are skipped otherwise.
+"""
+
+import random
+import unittest
+
+from redis.sansio import exceptions
+from redis.sansio._parser import PythonParser
+
+try:
+    from redis.sansio._cparser import CythonParser
+except (ImportError, ModuleNotFoundError):
+    CythonParser = None
+
+_NOT_ENOUGH_DATA = object()
+
+PAYLOADS = (
+    b"+OK\r\n",
+    b"+\r\n",
+    b"-ERR bad\r\n",
+    b"-\r\n",
+    b":123\r\n",
+    b":-42\r\n",
+    b"(3492890328409238509324850943850943825024385\r\n",
+    b",3.14\r\n",
+    b",inf\r\n",
+    b"#t\r\n",
+    b"#f\r\n",
+    b"_\r\n",
+    b"$5\r\nhello\r\n",
+    b"$0\r\n\r\n",
+    b"$-1\r\n",
+    b"$4\r\na\r\nb\r\n",
+    b"$2\r\n\xc3\xa9\r\n",
+    b"=8\r\ntxt:abcd\r\n",
+    b"=4\r\ntxt:\r\n",
+    b"*0\r\n",
+    b"*-1\r\n",
+    b"*-5\r\n",
+    b"%-2\r\n",
+    b"~-3\r\n",
+    b"*3\r\n:1\r\n$1\r\na\r\n+b\r\n",
+    b"*2\r\n*2\r\n:1\r\n:2\r\n*0\r\n",
+    b"~2\r\n:1\r\n:2\r\n",
+    b"%2\r\n+a\r\n:1\r\n+b\r\n*1\r\n:2\r\n",
+    b">2\r\n+msg\r\n:1\r\n",
+    b"*2\r\n-ERR x\r\n+OK\r\n",
+    # Protocol errors.
+    b"?foo\r\n",
+    b"*1\r\n?\r\n",
+    b"$3\r\nabcde\r\n",
+    b"$-5\r\n",
+    b"=-5\r\n",
+    b"=3\r\nabc\r\n",
+    b":12a\r\n",
+    b",abc\r\n",
+    # Lengths too large for a `Py_ssize_t`.
+    b"$99999999999999999999\r\nabc",
+    b"=99999999999999999999\r\ntxt:abc",
+    b"*99999999999999999999\r\n:1\r\n",
+    b"%99999999999999999999\r\n:1\r\n",
+    b"~99999999999999999999\r\n:1\r\n",
+)
+
+
+# Each payload, with its reply when parsed as bytes and when decoded as utf-8 (or
+#   `None` where decoding makes no difference).
+REPLIES = (
+    (b"+OK\r\n", b"OK", "OK"),
+    (b"+\r\n", b"", ""),
+    (b"-ERR bad\r\n", exceptions.ResponseError("ERR bad"), None),
+    (b"-\r\n", exceptions.ResponseError("Error"), None),
+    (b":123\r\n", 123, None),
+    (b":-42\r\n", -42, None),
+    (b":0\r\n", 0, None),
+    (b":12345678901234567890\r\n", 12345678901234567890, None),
+    (
+        b"(3492890328409238509324850943850943825024385\r\n",
+        3492890328409238509324850943850943825024385,
+        None,
+    ),
+    (b",3.14\r\n", 3.14, None),
+    (b",inf\r\n", float("inf"), None),
+    (b"#t\r\n", True, None),
+    (b"#f\r\n", False, None),
+    (b"_\r\n", None, None),
+    (b"$5\r\nhello\r\n", b"hello", "hello"),
+    (b"$0\r\n\r\n", b"", ""),
+    (b"$-1\r\n", None, None),
+    (b"$4\r\na\r\nb\r\n", b"a\r\nb", "a\r\nb"),
+    (b"$2\r\n\xc3\xa9\r\n", b"\xc3\xa9", "\xe9"),
+    (b"=8\r\ntxt:abcd\r\n", b"abcd", "abcd"),
+    (b"=4\r\ntxt:\r\n", b"", ""),
+    (b"*0\r\n", [], None),
+    (b"*-1\r\n", None, None),
+    (b"*-5\r\n", [], None),
+    (b"%-2\r\n", {}, None),
+    (b"~-3\r\n", set(), None),
+    (b"*3\r\n:1\r\n$1\r\na\r\n+b\r\n", [1, b"a", b"b"], [1, "a", "b"]),
+    (
+        b"*2\r\n-ERR x\r\n+OK\r\n",
+        [exceptions.ResponseError("ERR x"), b"OK"],
+        [exceptions.ResponseError("ERR x"), "OK"],
+    ),
+    (b"%1\r\n+a\r\n:1\r\n", {b"a": 1}, {"a": 1}),
+    (b"~2\r\n:1\r\n:2\r\n", {1, 2}, None),
+    (b">2\r\n+msg\r\n:1\r\n", [b"msg", 1], ["msg", 1]),
+)
+
+PROTOCOL_ERRORS = (
+    (b"?foo\r\n", "Protocol Error: '?'"),
+    (b"*1\r\n?\r\n", "Protocol Error: '?'"),
+    (b"$3\r\nabcde\r\n", "Expected b'\r\n'"),
+    (b"$-5\r\n", "Invalid length: -5"),
+    (b"=3\r\nabc\r\n", "Invalid verbatim string"),
+    (b"$99999999999999999999\r\nabc", "Invalid length: 99999999999999999999"),
+    (b"*99999999999999999999\r\n", "Invalid length: 99999999999999999999"),
+)
+
+
+def _normalize(val):
+    if isinstance(val, BaseException):
+        return type(val), tuple(_normalize(arg) for arg in val.args)
+    if isinstance(val, list):
+        return [_normalize(v) for v in val]
+    if isinstance(val, dict):
+        return {k: _normalize(v) for k, v in val.items()}
+    return val
+
+
+def _parse_all(parser_cls, payload, chunk, encoding):
+    parser = parser_cls(
+        protocolError=exceptions.InvalidResponse,
+        replyError=exceptions.ResponseError,
+        notEnoughData=_NOT_ENOUGH_DATA,
+        encoding=encoding,
+    )
+    replies = []
+    for i in range(0, len(payload), chunk):
+        parser.feed(payload[i : i + chunk])
+        try:
+            reply = parser.parse_one()
+            while reply is not _NOT_ENOUGH_DATA:
+                replies.append(_normalize(reply))
+                reply = parser.parse_one()
+        except (exceptions.InvalidResponse, UnicodeDecodeError) as exc:
+            replies.append(_normalize(exc))
+            break
+    return replies
+
+
+def _random_reply(rng, depth=0):
+    roll = rng.random()
+    if depth < 3 and roll < 0.3:
+        ctl = rng.choice(b"*~>%")
+        length = rng.randint(0, 4)
+        if ctl == ord("%"):
+            items = b"".join(
+                b":%d\r\n%s" % (rng.randint(-99, 99), _random_reply(rng, depth + 1))
+                for _ in range(length)
+            )
+        elif ctl == ord("~"):
+            items = b"".join(b":%d\r\n" % rng.randint(-99, 99) for _ in range(length))
+        else:
+            items = b"".join(_random_reply(rng, depth + 1) for _ in range(length))
+        return b"%c%d\r\n%s" % (ctl, length, items)
+    data = bytes(rng.choice(b"ab\r\n\xc3\xa9") for _ in range(rng.randint(0, 8)))
+    return rng.choice(
+        (
+            b"+simple\r\n",
+            b"-ERR oops\r\n",
+            b":%d\r\n" % rng.randint(-(10**20), 10**20),
+            b",%f\r\n" % rng.random(),
+            b"#t\r\n",
+            b"_\r\n",
+            b"$-1\r\n",
+            b"$%d\r\n%s\r\n" % (len(data), data),
+            b"=%d\r\ntxt:%s\r\n" % (len(data) + 4, data),
+        )
+    )
+
+
+class TestPythonParser(unittest.TestCase):
+    def assertReplies(self, payload, expected, encoding=None):
+        # Fed whole, a byte at a time, and pipelined in odd-sized chunks.
+        for chunk, times in ((len(payload), 1), (1, 1), (3, 3)):
+            with self.subTest(payload=payload, encoding=encoding, chunk=chunk):
+                self.assertEqual(
+                    _parse_all(PythonParser, payload * times, chunk, encoding),
+                    [_normalize(expected)] * times,
+                )
+
+    def test_replies(self):
+        for payload, raw, decoded in REPLIES:
+            self.assertReplies(payload, raw)
+            self.assertReplies(payload, raw if decoded is None else decoded, "utf-8")
+
+    def test_set_split_across_reads(self):
+        for chunk in (1, 2, 5):
+            with self.subTest(chunk=chunk):
+                self.assertEqual(
+                    _parse_all(PythonParser, b"~2\r\n:1\r\n:2\r\n", chunk, None),
+                    [{1, 2}],
+                )
+
+    def test_nested_split_across_reads(self):
+        # A dict whose value is itself an aggregate is left mid-value at some
+        #   split, as well as with a key waiting on its value at others.
+        payload = (
+            b"*4\r\n"
+            b"%2\r\n+k\r\n*2\r\n:1\r\n~1\r\n$3\r\nabc\r\n+k2\r\n>2\r\n+m\r\n:9\r\n"
+            b"~2\r\n:1\r\n:2\r\n"
+            b"%1\r\n$1\r\nx\r\n%1\r\n+y\r\n*1\r\n:3\r\n"
+            b"*0\r\n"
+        )
+        expected = [
+            {b"k": [1, {b"abc"}], b"k2": [b"m", 9]},
+            {1, 2},
+            {b"x": {b"y": [3]}},
+            [],
+        ]
+        for chunk in (1, 2, 3, 7):
+            for times in (1, 3):
+                with self.subTest(chunk=chunk, times=times):
+                    self.assertEqual(
+                        _parse_all(PythonParser, payload * times, chunk, None),
+                        [expected] * times,
+                    )
+
+    def test_pipelined_with_compaction(self):
+        # Long lines fed in small chunks, so the buffer is compacted part way
+        #   through a line which has already been partly scanned.
+        payload = b"".join(
+            b"*2\r\n+%s\r\n:%d\r\n" % (b"x" * i, i) for i in range(0, 200, 7)
+        )
+        expected = [[b"x" * i, i] for i in range(0, 200, 7)]
+        for chunk in (1, 5, 64):
+            with self.subTest(chunk=chunk):
+                self.assertEqual(
+                    _parse_all(PythonParser, payload, chunk, None), expected
+                )
+
+    def test_protocol_errors(self):
+        for payload, msg in PROTOCOL_ERRORS:
+            with self.subTest(payload=payload):
+                parser = PythonParser(
+                    protocolError=exceptions.InvalidResponse,
+                    replyError=exceptions.ResponseError,
+                    notEnoughData=_NOT_ENOUGH_DATA,
+                )
+                parser.feed(payload)
+                with self.assertRaises(exceptions.InvalidResponse) as ctx:
+                    parser.parse_one()
+                self.assertEqual(str(ctx.exception), msg)
+                # Protocol errors are sticky.
+                parser.feed(b"+OK\r\n")
+                with self.assertRaises(exceptions.InvalidResponse) as again:
+                    parser.parse_one()
+                self.assertIs(again.exception, ctx.exception)
+
+
+@unittest.skipIf(CythonParser is None, "redis.sansio._cparser is not built")
+class TestCythonParser(unittest.TestCase):
+    def assertSameReplies(self, payload):
+        for encoding in (None, "utf-8"):
+            for chunk in {1, 2, 3, 7, len(payload)}:
+                with self.subTest(payload=payload, encoding=encoding, chunk=chunk):
+                    self.assertEqual(
+                        _parse_all(CythonParser, payload, chunk, encoding),
+                        _parse_all(PythonParser, payload, chunk, encoding),
+                    )
+
+    def test_payloads(self):
+        for payload in PAYLOADS:
+            # Pipelined: the same payload several times over.
+            self.assertSameReplies(payload * 3)
+
+    def test_random_replies(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            payload = b"".join(_random_reply(rng) for _ in range(rng.randint(1, 5)))
+            self.assertSameReplies(payload)
+
+
+if __name__ == "__main__":
+    unittest.main()
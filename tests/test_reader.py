@@ -0,0 +1,29 @@
+import unittest
+
+from redis.sansio._reader import PythonBytesReader
+
+_NOT_ENOUGH_DATA = object()
+
+STRINGS = (
+    (b"+abc\r\n", b"abc", "abc"),
+    (b"$3\r\nabc\r\n", b"abc", "abc"),
+    (b"=7\r\ntxt:abc\r\n", b"abc", "abc"),
+)
+
+
+class TestPythonBytesReader(unittest.TestCase):
+    def test_set_encoding(self):
+        reader = PythonBytesReader(notEnoughData=_NOT_ENOUGH_DATA)
+        for encoding in (None, "utf-8", None):
+            reader.set_encoding(encoding)
+            for payload, raw, decoded in STRINGS:
+                with self.subTest(payload=payload, encoding=encoding):
+                    reader.feed(payload)
+                    reply = reader.gets()
+                    self.assertIs(type(reply), bytes if encoding is None else str)
+                    self.assertEqual(reply, raw if encoding is None else decoded)
+                    self.assertIs(reader.gets(), _NOT_ENOUGH_DATA)
+
+
+if __name__ == "__main__":
+    unittest.main()